@@ -1,16 +1,38 @@
 #!/usr/bin/env python3
 
 from __future__ import print_function
+from concurrent.futures import ProcessPoolExecutor
+import collections
+import copy
+import os
 from math import floor
 from datetime import datetime, timedelta
-from hashlib import md5
+from functools import lru_cache
+from hashlib import blake2b
 import itertools
+import struct
 from icalendar import Calendar
 from pytz import timezone, utc, all_timezones
 from tzlocal import get_localzone
 import click
 from pprint import pprint
-from dateutil.rrule import rrulestr, rruleset
+from dateutil.rrule import rrulestr
+
+UTC_TZ = utc
+# generate_id input: UTC start and end timestamps
+_ID_PACK = struct.Struct('<qq').pack
+
+@lru_cache(maxsize=None)
+def _get_tz(name):
+    '''Cached pytz.timezone lookup.
+    '''
+    return timezone(name)
+
+@lru_cache(maxsize=1)
+def _get_localzone():
+    '''Cached local timezone, resolved on first use.
+    '''
+    return get_localzone()
 
 def org_datetime(dt, tz):
     '''Timezone aware datetime to YYYY-MM-DD DayofWeek HH:MM str in localtime.
@@ -27,13 +49,20 @@ def format_datetime(dt, tz):
     '''
     return dt.astimezone(tz).strftime("%Y-%m-%d %H:%M")
 
+def _fmt_both(dt, tz):
+    '''Timezone aware datetime to (org_datetime, format_datetime) strs,
+    converting to localtime only once.
+    '''
+    dt = dt.astimezone(tz)
+    return dt.strftime("<%Y-%m-%d %a %H:%M>"), dt.strftime("%Y-%m-%d %H:%M")
+
 def get_datetime(dt, tz):
     '''Convert date or datetime to local datetime.
     '''
-    if isinstance(dt, datetime):
-        if not dt.tzinfo:
-            return dt.replace(tzinfo = tz)
+    if getattr(dt, 'tzinfo', None) is not None:
         return dt
+    if isinstance(dt, datetime):
+        return dt.replace(tzinfo = tz)
     # d is date. Being a naive date, let's suppose it is in local
     # timezone.  Unfortunately using the tzinfo argument of the standard
     # datetime constructors ''does not work'' with pytz for many
@@ -53,14 +82,20 @@ def advance_just_before(start_dt, timeframe_start, delta_days):
     '''Advance an start_dt datetime to the first date just before
     timeframe_start. Use delta_days for advancing the event. Precond:
     start_dt < timeframe_start'''
-    delta_ord = floor(
-        (timeframe_start.toordinal() - start_dt.toordinal() - 1) / delta_days)
-    return (add_delta_dst(
-        start_dt, timedelta(days=delta_days * int(delta_ord))), int(delta_ord))
-
-def generate_id(start_date, end_date, uid, timezone):
-    str_to_hash = u"{}{}{}".format(format_datetime(start_date, timezone), format_datetime(end_date, timezone), uid)
-    return md5(str_to_hash.encode()).hexdigest()
+    ord_int = int(floor(
+        (timeframe_start.toordinal() - start_dt.toordinal() - 1) / delta_days))
+    # same as add_delta_dst, inlined
+    tz = start_dt.tzinfo
+    return (tz.localize(start_dt.replace(tzinfo=None) + timedelta(days=delta_days * ord_int)),
+            ord_int)
+
+def generate_id(start_date, end_date, uid):
+    '''Hash the UTC start/end timestamps and the UID of an event occurrence.
+    '''
+    h = blake2b(digest_size=16)
+    h.update(_ID_PACK(int(start_date.timestamp()), int(end_date.timestamp())))
+    h.update(str(uid).encode())
+    return h.hexdigest()
 
 def generate_events(comp, timeframe_start, timeframe_end, tz, emails):
     '''Get iterator with the proper delta (days, weeks, etc)'''
@@ -68,80 +103,104 @@ def generate_events(comp, timeframe_start, timeframe_end, tz, emails):
     if comp.name != 'VEVENT':
         return []
 
-    if 'RRULE' in comp:
+    if comp.get('RRULE') is not None:
         return RecurringEvent(comp, timeframe_start, timeframe_end, tz)
 
     return SingleEvent(comp, timeframe_start, timeframe_end, tz, emails)
 
-def filter_events(events, comp, tz, emails):
-    '''Given a set of events (datetime objects), filter out some of them according to rules in comp.
-    @return remaining events
+def is_declined(comp, emails):
+    '''True if one attendee of comp is in emails and his status is declined.
     '''
-    exclude = set()
-    # filter out whole event series if one attendee is in emails and his status is declined
     attL = comp.get('ATTENDEE', None)
     if attL:
         if not isinstance(attL, list):
             attL = [attL]
         for att in attL:
             if att.params.get('PARTSTAT', '') == 'DECLINED' and att.params.get('CN', '') in emails:
-                return []
-    if 'EXDATE' in comp:
-        exdate = comp['EXDATE']
-        if isinstance(exdate, list):
-            exdate = itertools.chain.from_iterable([e.dts for e in exdate])
-        else:
-            exdate = exdate.dts
-        exclude = set(get_datetime(dt.dt, tz) for dt in exdate)
-    filtered_events = list()
-    for ev in events:
-        if ev in exclude:
-            continue
-        filtered_events.append(ev)
-    return filtered_events
+                return True
+    return False
+
+def iter_exdates(comp):
+    '''Iterate over the raw date/datetime values of the EXDATE properties of comp.
+    '''
+    exdate = comp.get('EXDATE')
+    if exdate is None:
+        return iter(())
+    if isinstance(exdate, list):
+        exdate = itertools.chain.from_iterable(e.dts for e in exdate)
+    else:
+        exdate = exdate.dts
+    return (e.dt for e in exdate)
+
+def get_exdates(comp, tz):
+    '''Set of localized datetimes excluded by the EXDATE properties of comp.
+    '''
+    # localize every distinct value only once
+    return set(get_datetime(dt, tz) for dt in set(iter_exdates(comp)))
+
+def is_exdate(ev, comp, tz):
+    '''True if the datetime ev is excluded by an EXDATE of comp.
+    '''
+    return any(get_datetime(dt, tz) == ev for dt in iter_exdates(comp))
+
+# Length in days of the rrule frequencies whose period is a fixed number
+# of days
+FREQ_DAYS = {'DAILY': 1, 'WEEKLY': 7}
+
+def fast_forward(rule, recur, dtstart, target):
+    '''Move the dtstart of the rrule rule to just before target, so that
+    between() does not have to walk every occurrence since the original
+    start. Only done for rules whose period is a whole number of days and
+    which are not limited by COUNT, where shifting dtstart by whole periods
+    leaves the occurrences unchanged. recur is the vRecur rule was parsed
+    from. Other rules are returned as they are.'''
+    freq_days = FREQ_DAYS.get(recur.get('FREQ', [None])[0])
+    if freq_days is None or 'COUNT' in recur:
+        return rule
+    step = timedelta(days=freq_days * int(recur.get('INTERVAL', [1])[0]))
+    # one period less, to stay clear of DST shifts
+    periods = (target - dtstart) // step - 1
+    if periods <= 0:
+        return rule
+    return rule.replace(dtstart=dtstart + periods * step)
 
 class RecurringEvent():
     '''Iterator for recurring events.'''
 
     def __init__(self, comp, timeframe_start, timeframe_end, tz):
         self.ev_start = get_datetime(comp['DTSTART'].dt, tz)
-        if "DTEND" not in comp:
+        dtend = comp.get('DTEND')
+        if dtend is None:
             self.ev_end = self.ev_start
         else:
-            self.ev_end = get_datetime(comp['DTEND'].dt, tz)
+            self.ev_end = get_datetime(dtend.dt, tz)
         self.duration = self.ev_end - self.ev_start
 
+        rrule = comp['RRULE'].to_ical().decode('utf-8')
         try:
-            self.recurrences = rrulestr(comp['RRULE'].to_ical().decode('utf-8'), dtstart=self.ev_start)
+            self.recurrences = rrulestr(rrule, dtstart=self.ev_start)
         except:
-            print('Could not decode RRULE: ' + comp['RRULE'].to_ical().decode('utf-8'))
-            self.recurrences = []
-        self.rules = rruleset()
-        self.rules.rrule(self.recurrences)
-
-        self.exclude = set()
-        if 'EXDATE' in comp:
-            exdate = comp['EXDATE']
-            if isinstance(exdate, list):
-                exdate = itertools.chain.from_iterable([e.dts for e in exdate])
-            else:
-                exdate = exdate.dts
-            self.exclude = set([get_datetime(dt.dt, tz) for dt in exdate])
+            print('Could not decode RRULE: ' + rrule)
+            self.recurrences = None
+        if self.recurrences is not None:
+            self.recurrences = fast_forward(
+                self.recurrences, comp['RRULE'], self.ev_start,
+                timeframe_start - self.duration)
 
-            for skip in self.exclude:
-                self.rules.exdate(skip)
+        self.exclude = get_exdates(comp, tz)
 
-        self.events = self.rules.between(timeframe_start, timeframe_end)
+        self.events = []
+        if self.recurrences is not None:
+            # between() stops as soon as it passes timeframe_end, so the
+            # plain rrule is enough; exdates are filtered afterwards
+            # instead of going through an rruleset.
+            self.events = [ev for ev in self.recurrences.between(timeframe_start, timeframe_end)
+                           if ev not in self.exclude]
 
     def __iter__(self):
-        return self
-
-    def __next__(self):
-        if self.events:
-            current = self.events.pop()
-            return (current,
-                    current.tzinfo.normalize(current+self.duration),1)
-        raise StopIteration
+        duration = self.duration
+        for current in self.events:
+            yield (current, current + duration, 1)
 
 class SingleEvent():
     '''Iterator for non-recurring single events.'''
@@ -150,117 +209,289 @@ class SingleEvent():
         ev_start = get_datetime(comp['DTSTART'].dt, tz)
         # Events with the same begin/end time same do not include
         # "DTEND".
-        if "DTEND" in comp:
-            ev_end = get_datetime(comp['DTEND'].dt, tz)
+        dtend = comp.get('DTEND')
+        if dtend is not None:
+            ev_end = get_datetime(dtend.dt, tz)
             self.duration = ev_end - ev_start
         else:
-            if "DURATION" in comp:
-                self.duration = comp['DURATION'].dt
+            duration = comp.get('DURATION')
+            if duration is not None:
+                self.duration = duration.dt
                 ev_end = ev_start + self.duration
             else:
                 ev_end = ev_start
         self.duration = ev_end - ev_start
         self.events = []
-        if (ev_start < timeframe_end and ev_end > timeframe_start):
-            self.events = [(ev_start, ev_end, 0)
-                           for ev_start in filter_events([ev_start], comp, tz, emails)]
+        if not (ev_start < timeframe_end and ev_end > timeframe_start):
+            return
+        if is_declined(comp, emails) or is_exdate(ev_start, comp, tz):
+            return
+        self.events = [(ev_start, ev_end, 0)]
+
     def __iter__(self):
         return iter(self.events)
 
 class IcalError(Exception):
     pass
 
+def _parse_chunk(lines):
+    '''Parse the lines of one or more components wrapped in a VCALENDAR.'''
+    try:
+        return Calendar.from_ical(u"\n".join(
+            itertools.chain([u"BEGIN:VCALENDAR"], lines, [u"END:VCALENDAR\n"])))
+    except ValueError as e:
+        msg = "Parsing error: {}".format(e)
+        raise IcalError(msg)
+
+def split_components(fh):
+    '''Split an ICS stream at the BEGIN/END markers of its VEVENT and
+    VTIMEZONE components. Yield (name, lines) for each of them.
+    Raise IcalError if the stream does not start with BEGIN:VCALENDAR.
+    '''
+    chunk = None
+    end = None
+    in_calendar = False
+    for line in fh:
+        line = line.rstrip(u"\r\n")
+        if not in_calendar:
+            if not line.strip():
+                continue
+            if line.lstrip(u"\ufeff").upper() != u"BEGIN:VCALENDAR":
+                raise IcalError("Parsing error: expected BEGIN:VCALENDAR, "
+                                "got {!r}".format(line[:40]))
+            in_calendar = True
+            continue
+        if chunk is None:
+            marker = line.upper()
+            if marker == u"BEGIN:VEVENT":
+                chunk, end = [line], u"END:VEVENT"
+            elif marker == u"BEGIN:VTIMEZONE":
+                chunk, end = [line], u"END:VTIMEZONE"
+            continue
+        chunk.append(line)
+        if line.upper() != end:
+            continue
+        yield end[4:], chunk
+        chunk = None
+    if chunk is not None:
+        raise IcalError("Parsing error: missing {}".format(end))
+    if not in_calendar:
+        raise IcalError("Parsing error: no VCALENDAR found")
+
+def iter_vevents(fh):
+    '''Lazily yield the VEVENT components of an ICS stream.
+
+    Instead of parsing the whole calendar up front, the stream is split at
+    the BEGIN/END markers and each VEVENT is parsed on its own. VTIMEZONE
+    blocks are parsed as they are met, so that icalendar registers custom
+    timezones before the events referring to them.
+    '''
+    for name, lines in split_components(fh):
+        cal = _parse_chunk(lines)
+        if name == u"VEVENT":
+            for comp in cal.walk('VEVENT'):
+                yield comp
+
+def _tzid(lines):
+    '''TZID value of the VTIMEZONE given by its (folded) lines.'''
+    for i, line in enumerate(lines):
+        name, _, value = line.partition(u":")
+        if name.split(u";", 1)[0].upper() != u"TZID":
+            continue
+        for cont in lines[i + 1:]:
+            if cont[:1] not in (u" ", u"\t"):
+                break
+            value += cont[1:]
+        return value
+    return None
+
+def _format_batch(args):
+    '''Worker side of Convertor.convert_parallel: parse and format each
+    VEVENT of the batch, registering beforehand the custom VTIMEZONE blocks
+    which preceded it in the input, as the serial path does.
+    @return list of (org_uid, UTF-8 encoded org entry)
+    '''
+    convertor, timezones, batch, start, end = args
+    registered = 0
+    entries = []
+    for n_timezones, lines in batch:
+        if n_timezones > registered:
+            # registers the custom timezones in icalendar's cache. Workers
+            # take batches in submission order, so a zone registered by an
+            # earlier batch also preceded every event seen later.
+            _parse_chunk(itertools.chain.from_iterable(
+                timezones[registered:n_timezones]))
+            registered = n_timezones
+        for comp in _parse_chunk(lines).walk('VEVENT'):
+            entries.extend(convertor.format_event(comp, start, end))
+    return entries
+
 class Convertor():
     RECUR_TAG = ":RECURRING:"
+    # Forget the ids of already written events past this many entries
+    MAX_HASHES = 200000
+    # Number of events sent to a worker process at once
+    JOB_CHUNKSIZE = 64
 
     # Do not change anything below
 
-    def __init__(self, days=90, tz=None, emails = [], include_location=True):
+    def __init__(self, days=90, tz=None, emails = [], include_location=True, jobs=1):
         """
         days: Window length in days (left & right from current time). Has
         to be positive.
         tz: timezone. If None, use local timezone.
         emails: list of user email addresses (to deal with declined events)
+        jobs: number of worker processes. 0 means one per CPU, 1 converts
+        in the current process.
         """
         self.emails = set(emails)
-        self.tz = timezone(tz) if tz else get_localzone()
+        self.tz = _get_tz(tz) if tz else _get_localzone()
         self.days = days
         self.include_location = include_location
-        self.hashes = []
+        self.jobs = jobs if jobs else (os.cpu_count() or 1)
+        self.hashes = set()
 
     def __call__(self, fh, fh_w):
-        try:
-            cal = Calendar.from_ical(fh.read())
-        except ValueError as e:
-            msg = "Parsing error: {}".format(e)
-            raise IcalError(msg)
-
         now = datetime.now(utc)
         start = now - timedelta(days=self.days)
         end = now + timedelta(days=self.days)
-        for comp in cal.walk():
-            # print(comp)
-            summary = None
-            if "SUMMARY" in comp:
-                summary = comp['SUMMARY'].to_ical().decode("utf-8")
-                summary = summary.replace('\\,', ',')
-            location = None
-            if "LOCATION" in comp:
-                location = comp['LOCATION'].to_ical().decode("utf-8")
-                location = location.replace('\\,', ',')
-            if not any((summary, location)):
-                summary = u"(No title)"
-            else:
-                summary += " - " + location if location and self.include_location else ''
-            description = None
-            if 'DESCRIPTION' in comp:
-                description = '\n'.join(comp['DESCRIPTION'].to_ical()
-                                        .decode("utf-8").split('\\n'))
-                description = description.replace('\\,', ',')
-            try:
-                events = generate_events(comp, start, end, self.tz, self.emails)
-                for comp_start, comp_end, rec_event in events:
-                    uid = comp.get('UID', '**NOID**')
-                    org_uid = generate_id(comp_start, comp_end, uid, self.tz)
-
-                    # Prune duplicates
-                    if org_uid in self.hashes:
-                        continue
-                    self.hashes.append(org_uid)
-
-                    fh_w.write(u"* {}".format(summary))
-                    if rec_event and self.RECUR_TAG:
-                        fh_w.write(u" {}\n".format(self.RECUR_TAG))
-                    fh_w.write(u"\n")
-                    fh_w.write(u":ICALCONTENTS:\n")
-                    fh_w.write(u":ORGUID: {}\n".format(org_uid))
-                    fh_w.write(u":ORIGINAL-UID: {}\n".format(uid))
-                    fh_w.write(u":DTSTART: {}\n".format(format_datetime(comp_start, self.tz)))
-                    fh_w.write(u":DTEND: {}\n".format(format_datetime(comp_end, self.tz)))
-                    fh_w.write(u":DTSTAMP: {}\n".format(format_datetime(comp['DTSTAMP'].dt, self.tz)))
-                    if 'ATTENDEE' in comp:
-                        for attendee in comp['ATTENDEE']:
-                            fh_w.write(u":ATTENDEE: {}\n".format(attendee))
-                    if 'ORGANIZER' in comp:
-                        fh_w.write(u":ORGANIZER: {}\n".format(comp['ORGANIZER']))
-                    if 'RRULE' in comp:
-                        fh_w.write(u":RRULE: {}\n".format(comp['RRULE']))
-                    fh_w.write(u":END:\n")
-                    if isinstance(comp["DTSTART"].dt, datetime):
-                        fh_w.write(u"  {}--{}\n".format(
-                            org_datetime(comp_start, self.tz),
-                            org_datetime(comp_end, self.tz)))
-                    else:  # all day event
-                        fh_w.write(u"  {}--{}\n".format(
-                            org_date(comp_start, timezone('UTC')),
-                            org_date(comp_end - timedelta(days=1), timezone('UTC'))))
-                    if description:
-                        fh_w.write(u"** Description\n\n")
-                        fh_w.write(u"{}\n".format(description))
-                    fh_w.write(u"\n")
-            except Exception as e:
-                msg = "Error: {}" .format(e)
-                raise IcalError(msg)
+        if self.jobs > 1:
+            converted = self.convert_parallel(fh, start, end)
+        else:
+            converted = (self.format_event(comp, start, end)
+                         for comp in iter_vevents(fh))
+        for entries in converted:
+            for org_uid, text in entries:
+                # Prune duplicates
+                if org_uid in self.hashes:
+                    continue
+                if len(self.hashes) >= self.MAX_HASHES:
+                    self.hashes.clear()
+                self.hashes.add(org_uid)
+                fh_w.write(text)
+
+    def convert_parallel(self, fh, start, end):
+        '''Format the VEVENTs of fh in a pool of worker processes.
+
+        The raw lines of the VEVENTs are sent to the workers in batches of
+        JOB_CHUNKSIZE and parsed again there. Each VEVENT carries the number
+        of custom (not known to pytz) VTIMEZONE blocks read before it, so
+        that workers see the same timezones as iter_vevents() does. At most
+        two batches per worker are in flight, so the input is still read
+        lazily. Results are returned in input order.
+        '''
+        worker = copy.copy(self)
+        worker.hashes = set()
+        timezones = []
+
+        def batches():
+            batch = []
+            for name, lines in split_components(fh):
+                if name == u"VTIMEZONE":
+                    # Not parsed here: forked workers would inherit the
+                    # registered zone for events preceding it.
+                    if _tzid(lines) not in all_timezones:
+                        timezones.append(lines)
+                    continue
+                # custom VTIMEZONE blocks read so far apply to this VEVENT
+                batch.append((len(timezones), lines))
+                if len(batch) >= self.JOB_CHUNKSIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        pending = collections.deque()
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            for batch in batches():
+                pending.append(executor.submit(
+                    _format_batch,
+                    (worker, timezones[:batch[-1][0]], batch, start, end)))
+                if len(pending) >= 2 * self.jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def format_event(self, comp, start, end):
+        '''Format the occurrences of comp within [start, end].
+        @return list of (org_uid, UTF-8 encoded org entry)
+        '''
+        summary = comp.get('SUMMARY')
+        if summary is not None:
+            summary = summary.to_ical().decode("utf-8")
+            summary = summary.replace('\\,', ',')
+        location = comp.get('LOCATION')
+        if location is not None:
+            location = location.to_ical().decode("utf-8")
+            location = location.replace('\\,', ',')
+        if not any((summary, location)):
+            summary = u"(No title)"
+        else:
+            summary += " - " + location if location and self.include_location else ''
+        description = comp.get('DESCRIPTION')
+        if description is not None:
+            description = description.to_ical().decode("utf-8")
+            description = description.replace('\\n', '\n').replace('\\,', ',')
+        entries = []
+        try:
+            events = generate_events(comp, start, end, self.tz, self.emails)
+            uid = comp.get('UID', '**NOID**')
+            header = u"* {}".format(summary)
+            recur_header = header
+            if self.RECUR_TAG:
+                recur_header += u" {}\n".format(self.RECUR_TAG)
+            # Properties which are the same for every occurrence
+            props = []
+            dtstamp = comp.get('DTSTAMP')
+            if dtstamp is not None:
+                props.append(u":DTSTAMP: {}\n".format(
+                    format_datetime(dtstamp.dt, self.tz)))
+            attendees = comp.get('ATTENDEE')
+            if attendees is not None:
+                if not isinstance(attendees, list):
+                    attendees = [attendees]
+                props.extend(u":ATTENDEE: {}\n".format(attendee)
+                             for attendee in attendees)
+            organizer = comp.get('ORGANIZER')
+            if organizer is not None:
+                props.append(u":ORGANIZER: {}\n".format(organizer))
+            rrule = comp.get('RRULE')
+            if rrule is not None:
+                props.append(u":RRULE: {}\n".format(rrule))
+            props.append(u":END:\n")
+            props = u"".join(props)
+            dtstart = comp.get('DTSTART')
+            all_day = dtstart is not None and not isinstance(dtstart.dt, datetime)
+            footer = u"\n"
+            if description:
+                footer = u"** Description\n\n{}\n\n".format(description)
+            for comp_start, comp_end, rec_event in events:
+                org_uid = generate_id(comp_start, comp_end, uid)
+                if all_day:
+                    dtstart_str = format_datetime(comp_start, self.tz)
+                    dtend_str = format_datetime(comp_end, self.tz)
+                    timestamp = u"  {}--{}\n".format(
+                        org_date(comp_start, UTC_TZ),
+                        org_date(comp_end - timedelta(days=1), UTC_TZ))
+                else:
+                    org_start, dtstart_str = _fmt_both(comp_start, self.tz)
+                    org_end, dtend_str = _fmt_both(comp_end, self.tz)
+                    timestamp = u"  {}--{}\n".format(org_start, org_end)
+                entries.append((org_uid, u"".join((
+                    recur_header if rec_event else header,
+                    u"\n:ICALCONTENTS:\n"
+                    u":ORGUID: {}\n"
+                    u":ORIGINAL-UID: {}\n"
+                    u":DTSTART: {}\n"
+                    u":DTEND: {}\n".format(
+                        org_uid, uid, dtstart_str, dtend_str),
+                    props,
+                    timestamp,
+                    footer)).encode("utf-8")))
+        except Exception as e:
+            msg = "Error: {}" .format(e)
+            raise IcalError(msg)
+        return entries
 
 def check_timezone(ctx, param, value):
     if (value is None) or (value in all_timezones):
@@ -310,9 +541,16 @@ def print_timezones(ctx, param, value):
     "include_location",
     default=True,
     help="Include the location (if present) in the headline. (Location is included by default).")
+@click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    type=click.IntRange(0, clamp=True),
+    help=("Number of worker processes converting events in parallel. "
+          "0 uses one per CPU. Default is 1 (no worker processes)."))
 @click.argument("ics_file", type=click.File("r", encoding="utf-8"))
-@click.argument("org_file", type=click.File("w", encoding="utf-8"))
-def main(ics_file, org_file, email, days, timezone, include_location):
+@click.argument("org_file", type=click.File("wb"))
+def main(ics_file, org_file, email, days, timezone, include_location, jobs):
     """Convert ICAL format into org-mode.
 
     Files can be set as explicit file name, or `-` for stdin or stdout::
@@ -325,7 +563,7 @@ def main(ics_file, org_file, email, days, timezone, include_location):
 
         $ cat in.ical | ical2orgpy - - > out.org
     """
-    convertor = Convertor(days, timezone, email, include_location)
+    convertor = Convertor(days, timezone, email, include_location, jobs)
     try:
         convertor(ics_file, org_file)
     except IcalError as e:
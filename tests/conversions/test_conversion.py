@@ -1,4 +1,5 @@
 from datetime import datetime
+import uuid
 import pytest
 from py.path import local
 import yaml
@@ -83,9 +84,79 @@ def test_conversion(scenario, tmpdir):
     result_file = tmpdir / "output.org"
     with scenario.freeze_time():
         with ics_file.open("r", encoding="utf-8") as ics_f:
-            with result_file.open("w", encoding="utf-8") as result_f:
+            with result_file.open("wb") as result_f:
                 convertor(ics_f, result_f)
     assert result_file.exists()
     res_txt = result_file.read_text(encoding="utf-8")
     exp_txt = expected_file.read_text(encoding="utf-8")
     assert res_txt == exp_txt
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda itm: itm.name)
+def test_parallel_conversion(scenario, tmpdir):
+    """Converting with worker processes gives the same result as without."""
+    results = []
+    # parallel first: the serial run registers custom timezones in this
+    # process, which forked workers would inherit
+    for jobs in (2, 1):
+        convertor = Convertor(scenario.parameters["days"],
+                              scenario.parameters["tzone"],
+                              jobs=jobs)
+        result_file = tmpdir / "output.{}.org".format(jobs)
+        with scenario.freeze_time():
+            with scenario.ics_file.open("r", encoding="utf-8") as ics_f:
+                with result_file.open("wb") as result_f:
+                    convertor(ics_f, result_f)
+        results.append(result_file.read_binary())
+    parallel, serial = results
+    assert serial
+    assert parallel == serial
+
+
+TZ_ORDER_ICS = u"""BEGIN:VCALENDAR
+BEGIN:VEVENT
+DTSTART;TZID={tzid}:20171210T100000
+DTEND;TZID={tzid}:20171210T110000
+DTSTAMP:20171215T003000Z
+UID:before-zone@example.com
+SUMMARY:Before zone
+END:VEVENT
+BEGIN:VTIMEZONE
+TZID:{tzid}
+BEGIN:STANDARD
+TZOFFSETFROM:+0530
+TZOFFSETTO:+0530
+TZNAME:IST
+DTSTART:19700101T000000
+END:STANDARD
+END:VTIMEZONE
+BEGIN:VEVENT
+DTSTART;TZID={tzid}:20171211T100000
+DTEND;TZID={tzid}:20171211T110000
+DTSTAMP:20171215T003000Z
+UID:after-zone@example.com
+SUMMARY:After zone
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_parallel_conversion_timezone_order(tmpdir):
+    """A custom VTIMEZONE applies only to the events following it, with or
+    without worker processes."""
+    results = []
+    for jobs in (2, 1):
+        # icalendar caches custom timezones per process, so every run
+        # gets a fresh TZID
+        ics_file = tmpdir / "input.{}.ics".format(jobs)
+        ics_file.write_text(TZ_ORDER_ICS.format(tzid="Custom {}".format(uuid.uuid4())),
+                            encoding="utf-8")
+        convertor = Convertor(36500, "Europe/Prague", jobs=jobs)
+        result_file = tmpdir / "output.{}.org".format(jobs)
+        with ics_file.open("r", encoding="utf-8") as ics_f:
+            with result_file.open("wb") as result_f:
+                convertor(ics_f, result_f)
+        results.append(result_file.read_binary())
+    parallel, serial = results
+    assert b"<2017-12-11 Mon 05:30>--<2017-12-11 Mon 06:30>" in serial
+    assert parallel == serial
@@ -2,9 +2,11 @@ from datetime import datetime, timedelta
 
 import pytest
 
+from dateutil.rrule import rrulestr
+from icalendar import vRecur
 from pytz import timezone, utc
 
-from ical2orgpy import add_delta_dst, advance_just_before
+from ical2orgpy import add_delta_dst, advance_just_before, fast_forward
 
 # Timezone in Prague
 PRAGUE = timezone("Europe/Prague")
@@ -44,3 +46,46 @@ def test_advance_just_before(start_dt, timeframe_start, delta_days, expected):
     assert res_dt.day == exp_dt.day
     assert res_dt.hour == exp_dt.hour
     assert res_dt.minute == exp_dt.minute
+
+
+@pytest.mark.parametrize(
+    "rule, dtstart, timeframe_start",
+    [("FREQ=DAILY;INTERVAL=3",
+      PRAGUE.localize(datetime(2010, 1, 4, 9, 0)),
+      datetime(2017, 11, 20, 12, 0, 0, 0, utc)),
+     ("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",
+      PRAGUE.localize(datetime(2009, 5, 7, 9, 30)),
+      datetime(2017, 11, 20, 12, 0, 0, 0, utc)),
+     ("FREQ=WEEKLY;UNTIL=20180301T000000Z",
+      PRAGUE.localize(datetime(2012, 3, 1, 14, 0)),
+      datetime(2017, 11, 20, 12, 0, 0, 0, utc)),
+     # starts in summer time, window spans the March DST change
+     ("FREQ=DAILY",
+      PRAGUE.localize(datetime(2015, 6, 1, 9, 0)),
+      datetime(2018, 1, 1, 12, 0, 0, 0, utc))],
+    ids=lambda itm: str(itm))
+def test_fast_forward(rule, dtstart, timeframe_start):
+    recur = vRecur.from_ical(rule)
+    timeframe_end = timeframe_start + timedelta(days=180)
+    duration = timedelta(hours=1)
+    original = rrulestr(rule, dtstart=dtstart)
+    res = fast_forward(rrulestr(rule, dtstart=dtstart), recur, dtstart,
+                       timeframe_start - duration)
+    assert next(iter(res)) > next(iter(original))
+    assert (res.between(timeframe_start, timeframe_end) ==
+            original.between(timeframe_start, timeframe_end))
+
+
+@pytest.mark.parametrize(
+    "rule, dtstart",
+    [("FREQ=MONTHLY;BYMONTHDAY=15",
+      PRAGUE.localize(datetime(2010, 1, 15, 9, 0))),
+     ("FREQ=DAILY;COUNT=5000",
+      PRAGUE.localize(datetime(2010, 1, 4, 9, 0)))],
+    ids=lambda itm: str(itm))
+def test_fast_forward_unchanged(rule, dtstart):
+    recur = vRecur.from_ical(rule)
+    original = rrulestr(rule, dtstart=dtstart)
+    res = fast_forward(original, recur, dtstart,
+                       datetime(2017, 11, 20, 12, 0, 0, 0, utc))
+    assert res is original
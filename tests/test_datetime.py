@@ -1,11 +1,13 @@
 """Test functions related to simple time conversions.
 """
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 import pytest
 from pytz import timezone, utc
 
-from ical2orgpy import org_datetime, org_date, get_datetime
+from icalendar import Calendar
+
+from ical2orgpy import org_datetime, org_date, get_datetime, RecurringEvent
 
 # Timezone in Prague
 PRAGUE = timezone("Europe/Prague")
@@ -64,3 +66,26 @@ def test_get_datetime_datetime(dt, tz, expected):
     delta = (res - expected).total_seconds()
     # tolerate 5 minutes difference (yes, it happens)
     assert abs(delta) < 5 * 60
+
+
+@pytest.mark.parametrize(
+    "dtstart, dtend, expected", [
+        # floating times get the zone attached as is (LMT offset for pytz);
+        # the end shall still be start + duration in wall clock time
+        ("20180108T020000", "20180108T023000",
+         [("<2018-01-08 Mon 02:00>", "<2018-01-08 Mon 02:30>"),
+          ("<2018-01-09 Tue 02:00>", "<2018-01-09 Tue 02:30>")]),
+        ("20180108T010000Z", "20180108T013000Z",
+         [("<2018-01-08 Mon 02:00>", "<2018-01-08 Mon 02:30>"),
+          ("<2018-01-09 Tue 02:00>", "<2018-01-09 Tue 02:30>")]),
+    ],
+    ids=lambda itm: str(itm))
+def test_recurring_event_end(dtstart, dtend, expected):
+    comp = Calendar.from_ical(
+        "BEGIN:VEVENT\r\nDTSTART:{}\r\nDTEND:{}\r\n"
+        "RRULE:FREQ=DAILY;COUNT=2\r\nEND:VEVENT\r\n".format(dtstart, dtend))
+    timeframe_start = datetime(2018, 1, 1, 0, 0, 0, 0, UTC)
+    res = [(org_datetime(start, PRAGUE), org_datetime(end, PRAGUE))
+           for start, end, _ in RecurringEvent(
+               comp, timeframe_start, timeframe_start + timedelta(days=30), PRAGUE)]
+    assert res == expected
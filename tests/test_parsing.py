@@ -0,0 +1,83 @@
+"""Test splitting of an ICS stream into components.
+"""
+import io
+
+import pytest
+
+from ical2orgpy import IcalError, iter_vevents, split_components
+
+EVENT = [
+    "BEGIN:VEVENT",
+    "DTSTART:20171214T163000Z",
+    "DTEND:20171214T183000Z",
+    "UID:4dj32oskiug8g6juchr0168ild@google.com",
+    "SUMMARY:Visit dragons",
+    "END:VEVENT",
+]
+
+TIMEZONE = [
+    "BEGIN:VTIMEZONE",
+    "TZID:Europe/Prague",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:+0200",
+    "TZOFFSETTO:+0100",
+    "DTSTART:19701025T030000",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+]
+
+
+def ics(*lines):
+    return io.StringIO(u"\r\n".join(lines) + u"\r\n")
+
+
+@pytest.mark.parametrize(
+    "fh, expected", [
+        (ics("BEGIN:VCALENDAR", *EVENT + ["END:VCALENDAR"]),
+         [("VEVENT", EVENT)]),
+        (ics("BEGIN:VCALENDAR", *TIMEZONE + EVENT + ["END:VCALENDAR"]),
+         [("VTIMEZONE", TIMEZONE), ("VEVENT", EVENT)]),
+        (ics("begin:vcalendar", *[l.lower() for l in EVENT] + ["end:vcalendar"]),
+         [("VEVENT", [l.lower() for l in EVENT])]),
+        (ics("BEGIN:VCALENDAR", "END:VCALENDAR"), []),
+    ],
+    ids=["event", "timezone", "lowercase", "no events"])
+def test_split_components(fh, expected):
+    res = list(split_components(fh))
+    assert res == expected
+
+
+def test_iter_vevents_folded_lines():
+    fh = ics("BEGIN:VCALENDAR",
+             "BEGIN:VEVENT",
+             "DTSTART:20171214T163000Z",
+             "SUMMARY:Visit",
+             " dragons",
+             "DESCRIPTION:line one\\n",
+             " line two",
+             "END:VEVENT",
+             "END:VCALENDAR")
+    comps = list(iter_vevents(fh))
+    assert len(comps) == 1
+    assert comps[0]['SUMMARY'] == "Visitdragons"
+    assert comps[0]['DESCRIPTION'] == "line one\nline two"
+
+
+def test_iter_vevents_lowercase():
+    fh = ics("begin:vcalendar", *[l.lower() for l in EVENT] + ["end:vcalendar"])
+    comps = list(iter_vevents(fh))
+    assert len(comps) == 1
+    assert comps[0]['SUMMARY'] == "visit dragons"
+
+
+@pytest.mark.parametrize(
+    "fh", [
+        ics("BEGIN:VCALENDAR", *EVENT[:-1] + ["END:VCALENDAR"]),
+        ics("not an ics file"),
+        io.StringIO(u""),
+        ics("", "   "),
+    ],
+    ids=["missing END:VEVENT", "garbage", "empty", "blank"])
+def test_split_components_error(fh):
+    with pytest.raises(IcalError):
+        list(split_components(fh))